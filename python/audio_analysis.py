@@ -4,16 +4,29 @@ Audio Analysis using Librosa
 Provides real tempo, beat, energy, and spectral feature extraction
 """
 
+import argparse
+import math
+import os
 import sys
 import json
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
 # Suppress librosa warnings
 warnings.filterwarnings('ignore')
 
+# Persist numba-compiled kernels (librosa's and ours) across runs so only
+# the first run pays for JIT compilation; must be set before numba loads
+NUMBA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sora-director', 'numba')
+os.environ.setdefault('NUMBA_CACHE_DIR', NUMBA_CACHE_DIR)
+
 try:
     import librosa
     import numpy as np
+    import scipy.fft
+    import soundfile as sf
+    from numba import njit
 except ImportError:
     print(json.dumps({
         "error": "librosa not installed",
@@ -21,60 +34,403 @@ except ImportError:
     }))
     sys.exit(1)
 
+try:
+    # Available in SciPy 1.12+
+    from scipy.signal import ShortTimeFFT, get_window
+except ImportError:
+    ShortTimeFFT = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+# Analysis sample rate - 22050 for faster processing while maintaining quality
+TARGET_SR = 22050
+
+# STFT parameters shared by all spectral features (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Approximate output rate (Hz) of the spectral feature arrays
+SPECTRAL_FEATURE_RATE = 10
+
+# Minimum track length (seconds) for the GPU path; below this the upload
+# and kernel launch overhead outweighs the faster FFT
+GPU_MIN_DURATION = 60.0
+
+# Default batch workers with --device cuda; each worker creates its own
+# CUDA context, so one worker per CPU core would exhaust GPU memory
+GPU_BATCH_WORKERS = 1
+
+# Number of threads for FFTs (-1 = all cores)
+FFT_WORKERS = -1
+
+# Route librosa's FFTs (now only the short-clip STFT fallback) through
+# scipy.fft, which supports multithreading. librosa 0.11+ already uses
+# scipy.fft and deprecates set_fftlib, so only librosa 0.10 needs this
+_get_fftlib = getattr(librosa, 'get_fftlib', None)
+if _get_fftlib is not None and _get_fftlib() is not scipy.fft:
+    librosa.set_fftlib(scipy.fft)
+
+# Decode buffer reused across files by batch workers (None = allocate per file)
+_read_buffer = None
+
+# Largest decode (in samples, all channels) that reuses the buffer; 64 MB of
+# float32, about 5.8 minutes of 48 kHz stereo. Longer files get a fresh array
+# so one long track doesn't pin its size in every worker for the whole run
+READ_BUFFER_MAX_SAMPLES = 16 * 1024 * 1024
+
+
+def load_audio(audio_path, sr=TARGET_SR):
+    """
+    Load audio as a mono float32 waveform at the analysis sample rate
+    
+    Decodes with soundfile directly and only resamples when the file's
+    native rate differs; formats libsndfile can't read fall back to
+    librosa.load.
+    
+    Args:
+        audio_path: Path to audio file
+        sr: Target sample rate
+        
+    Returns:
+        Tuple of (waveform, sample_rate)
+    """
+    try:
+        if _read_buffer is None:
+            y, sr_orig = sf.read(audio_path, dtype='float32', always_2d=True)
+        else:
+            y, sr_orig = _read_reusing_buffer(audio_path)
+    except RuntimeError:
+        return librosa.load(audio_path, sr=sr, mono=True, dtype=np.float32)
+    
+    y = y.mean(axis=1) if y.shape[1] > 1 else y[:, 0]
+    
+    if sr_orig != sr:
+        y = librosa.resample(y, orig_sr=sr_orig, target_sr=sr, res_type='soxr_hq')
+    
+    return y, sr
+
+
+def _read_reusing_buffer(audio_path):
+    """
+    Decode a file into the shared read buffer, growing it when needed
+    
+    The returned samples are a view into the buffer and are overwritten
+    by the next read. Files over READ_BUFFER_MAX_SAMPLES are read into a
+    fresh array instead.
+    """
+    global _read_buffer
+    with sf.SoundFile(audio_path) as f:
+        size = f.frames * f.channels
+        if f.frames <= 0 or size > READ_BUFFER_MAX_SAMPLES:
+            return f.read(dtype='float32', always_2d=True), f.samplerate
+        
+        if _read_buffer.size < size:
+            _read_buffer = np.empty(size, dtype=np.float32)
+        
+        out = _read_buffer[:size].reshape(f.frames, f.channels)
+        return f.read(always_2d=True, out=out), f.samplerate
+
+
+@lru_cache(maxsize=None)
+def _mel_basis(sr):
+    """Mel filter bank for the analysis STFT (librosa doesn't cache it by default)"""
+    return librosa.filters.mel(sr=sr, n_fft=N_FFT)
+
+
+@lru_cache(maxsize=None)
+def _short_time_fft(sr):
+    """ShortTimeFFT plan with the analysis window and hop"""
+    return ShortTimeFFT(get_window('hann', N_FFT), hop=HOP_LENGTH, fs=sr, mfft=N_FFT)
+
+
+def magnitude_spectrogram(y, sr):
+    """
+    Magnitude STFT matching librosa.stft's centered, zero-padded frames
+    
+    Uses SciPy's ShortTimeFFT, which windows a strided view of the signal
+    directly instead of padding and framing a copy, and falls back to
+    librosa.stft on older SciPy and for signals shorter than half a frame
+    (which ShortTimeFFT rejects).
+    
+    Args:
+        y: Audio time series
+        sr: Sample rate
+        
+    Returns:
+        float32 array of shape (1 + N_FFT // 2, frames)
+    """
+    with scipy.fft.set_workers(FFT_WORKERS):
+        if ShortTimeFFT is None or len(y) < N_FFT // 2:
+            S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+        else:
+            S = np.abs(_short_time_fft(sr).stft(y, p0=0, p1=1 + len(y) // HOP_LENGTH))
+    
+    return S.astype(np.float32, copy=False)
+
+
+def spectral_features(y, sr):
+    """
+    Mel power spectrogram and spectral features from one shared STFT
+    
+    Args:
+        y: Audio time series
+        sr: Sample rate
+        
+    Returns:
+        Tuple of (mel spectrogram, centroid, rolloff, bandwidth)
+    """
+    S = magnitude_spectrogram(y, sr)
+    mel = _mel_basis(sr) @ S**2
+    
+    # (librosa's frequency grids are float64, so cast back to float32)
+    centroid = librosa.feature.spectral_centroid(S=S, sr=sr)[0].astype(np.float32, copy=False)
+    rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr)[0].astype(np.float32, copy=False)
+    bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sr)[0].astype(np.float32, copy=False)
+    
+    return mel, centroid, rolloff, bandwidth
+
+
+def spectral_features_torch(y, sr, device='cuda'):
+    """
+    GPU version of spectral_features() using PyTorch
+    
+    The waveform is uploaded once and only the mel spectrogram and the
+    per-frame features are copied back, not the full STFT. Matches
+    librosa's centered, zero-padded frames and feature definitions.
+    
+    Args:
+        y: Audio time series
+        sr: Sample rate
+        device: Torch device to run on
+        
+    Returns:
+        Tuple of (mel spectrogram, centroid, rolloff, bandwidth)
+    """
+    import torch
+    
+    with torch.no_grad():
+        yt = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).to(device)
+        window = torch.hann_window(N_FFT, periodic=True, device=device)
+        S = torch.stft(
+            yt, n_fft=N_FFT, hop_length=HOP_LENGTH, window=window,
+            center=True, pad_mode='constant', return_complex=True
+        ).abs()
+        
+        freqs = torch.from_numpy(
+            librosa.fft_frequencies(sr=sr, n_fft=N_FFT).astype(np.float32)
+        ).to(device)[:, None]
+        mel_basis = torch.from_numpy(_mel_basis(sr)).to(device)
+        
+        mel = mel_basis @ S**2
+        
+        # Per-frame spectral distribution (silent frames stay all-zero)
+        total = S.sum(dim=0)
+        S_norm = S / torch.where(total > 0, total, torch.ones_like(total))
+        centroid = (freqs * S_norm).sum(dim=0)
+        bandwidth = ((freqs - centroid)**2 * S_norm).sum(dim=0).sqrt()
+        
+        # First bin where the cumulative energy reaches 85% of the total
+        cumulative = S.cumsum(dim=0)
+        rolloff_bin = (cumulative < 0.85 * cumulative[-1:]).sum(dim=0)
+        rolloff = freqs[:, 0][rolloff_bin.clamp(max=freqs.shape[0] - 1)]
+        
+        return tuple(t.cpu().numpy() for t in (mel, centroid, rolloff, bandwidth))
+
+
+def _cuda_available():
+    """Check for PyTorch with a usable CUDA device"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+# Build the filter bank and STFT plan for the usual sample rate up front,
+# so they are shared by every analysis (and inherited by batch workers)
+_mel_basis(TARGET_SR)
+if ShortTimeFFT is not None:
+    _short_time_fft(TARGET_SR)
+
+
+def zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH, threshold=1e-10):
+    """
+    Zero-crossing rate per frame, matching librosa.feature.zero_crossing_rate
+    
+    Instead of framing the signal and comparing signs frame by frame, sign
+    changes are found in one signbit XOR pass over the whole signal and
+    counted per frame from their running sum.
+    
+    Args:
+        y: Audio time series
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+        threshold: Values with magnitude at or below this count as zero
+        
+    Returns:
+        Array of zero-crossing rates, one per frame
+    """
+    # Centered frames, edge-padded like librosa
+    y = np.pad(y, frame_length // 2, mode='edge')
+    
+    # Near-zero values count as positive
+    negative = np.signbit(y) & (np.abs(y) > threshold)
+    crossings = np.cumsum(negative[1:] ^ negative[:-1], dtype=np.int64)
+    crossings = np.concatenate(([0], crossings))
+    
+    # Each frame spans frame_length - 1 adjacent sample pairs
+    starts = np.arange(1 + (len(y) - frame_length) // hop_length) * hop_length
+    counts = crossings[starts + frame_length - 1] - crossings[starts]
+    
+    return (counts / frame_length).astype(np.float32)
+
+
+def _downsample(values, factor):
+    """Average consecutive blocks of frames (the last block may be shorter)"""
+    starts = np.arange(0, values.size, factor)
+    return np.add.reduceat(values, starts) / np.diff(np.append(starts, values.size))
+
+
+def _rounded(values, decimals=4):
+    """
+    Round a feature array for JSON output
+    
+    Values are widened before rounding: rounded float32 values serialize
+    with spurious trailing digits once converted to Python floats.
+    """
+    return np.round(values.astype(np.float64), decimals)
+
+
+def _json_default(obj):
+    """Serialize NumPy values for the stdlib json fallback"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(result, indent=False):
+    """
+    Write a result to stdout as a line of JSON
+    
+    Uses orjson when installed, which serializes NumPy arrays directly in C
+    instead of going through one Python float per element.
+    
+    Args:
+        result: Result dictionary (may contain NumPy arrays)
+        indent: Pretty-print with 2-space indentation
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(result, option=option))
+        sys.stdout.buffer.flush()
+    else:
+        if indent:
+            output = json.dumps(result, indent=2, default=_json_default)
+        else:
+            output = json.dumps(result, separators=(',', ':'), default=_json_default)
+        print(output, flush=True)
+
 
-def analyze_audio(audio_path):
+def analyze_audio(audio_path, bpm_hint=None, device='cpu'):
     """
     Comprehensive audio analysis using librosa
     
     Args:
         audio_path: Path to audio file
+        bpm_hint: Known tempo in BPM; skips tempo estimation when given
+        device: 'cuda' to compute spectral features on the GPU for tracks
+            longer than GPU_MIN_DURATION (falls back to CPU if unavailable)
         
     Returns:
         Dictionary with tempo, beats, energy, and spectral features
     """
     try:
-        # Load audio file with librosa
-        # Using sr=22050 for faster processing while maintaining quality
-        y, sr = librosa.load(audio_path, sr=22050, mono=True)
+        # Load audio file
+        y, sr = load_audio(audio_path)
         
         # Get duration
         duration = librosa.get_duration(y=y, sr=sr)
         
+        # Single magnitude STFT shared by every spectral feature,
+        # instead of each feature recomputing its own
+        if device == 'cuda' and duration >= GPU_MIN_DURATION and _cuda_available():
+            features = spectral_features_torch(y, sr, device)
+        else:
+            features = spectral_features(y, sr)
+        mel, spectral_centroids, spectral_rolloff, spectral_bandwidth = features
+        
+        # Log-power mel spectrogram shared by beat tracking and the rhythm
+        # metrics (the same input onset_strength builds from y by default)
+        mel_db = librosa.power_to_db(mel)
+        onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr)
+        
         # Tempo and beat detection
-        tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-        beat_times = librosa.frames_to_time(beat_frames, sr=sr)
+        # (beat_track aggregates its own onset envelope with the median)
+        # trim=False keeps the weak leading/trailing beats without a
+        # separate trimming pass
+        beat_onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, aggregate=np.median)
+        tempo, beat_frames = librosa.beat.beat_track(
+            onset_envelope=beat_onset_env,
+            sr=sr,
+            hop_length=HOP_LENGTH,
+            bpm=bpm_hint,
+            tightness=100,
+            trim=False
+        )
+        # Newer librosa returns tempo as a one-element array
+        tempo = np.atleast_1d(tempo)[0]
+        beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=HOP_LENGTH)
         
         # Create beat info with confidence scores
-        beats = []
-        for beat_time in beat_times:
-            beats.append({
-                "time": float(beat_time),
+        # (tolist() converts the whole array to Python floats in one pass)
+        beats = [
+            {
+                "time": beat_time,
                 "confidence": 0.85,  # Librosa doesn't provide confidence, use default
                 "strength": 0.8
-            })
+            }
+            for beat_time in beat_times.tolist()
+        ]
         
         # Energy analysis using RMS (Root Mean Square)
-        rms = librosa.feature.rms(y=y)[0]
-        rms_times = librosa.times_like(rms, sr=sr)
+        # (from the raw frames: the STFT is Hann-windowed, which would smear
+        # transients and lower the levels)
+        rms = librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
         
         # Normalize RMS to 0-1 range
-        rms_normalized = rms / (np.max(rms) if np.max(rms) > 0 else 1.0)
+        # (one max reduction, then a multiply by its reciprocal)
+        rms_max = float(rms.max())
+        rms_normalized = rms * (1.0 / rms_max if rms_max > 1e-12 else 1.0)
+        
+        # One level per hop; frame i is at time i * hop / sr
+        energy_levels = {
+            "hop": HOP_LENGTH,
+            "sr": int(sr),
+            "levels": _rounded(rms_normalized)
+        }
         
-        energy_levels = []
-        for t, level in zip(rms_times, rms_normalized):
-            energy_levels.append({
-                "time": float(t),
-                "level": float(level)
-            })
+        # Zero-crossing rate (time domain)
+        zcr = zero_crossing_rate(y)
         
-        # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-        zero_crossing_rate = librosa.feature.zero_crossing_rate(y)[0]
+        # Average spectral features down to ~SPECTRAL_FEATURE_RATE frames/sec;
+        # the per-hop rate is far finer than consumers need
+        feature_factor = max(1, round(sr / HOP_LENGTH / SPECTRAL_FEATURE_RATE))
+        feature_rate = sr / HOP_LENGTH / feature_factor
         
         # Calculate rhythm metrics
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
         rhythm_strength = float(np.mean(onset_env))
         rhythm_regularity = calculate_rhythm_regularity(beat_times)
         
@@ -85,10 +441,10 @@ def analyze_audio(audio_path):
             "beats": beats,
             "energy": energy_levels,
             "spectralFeatures": {
-                "centroid": spectral_centroids.tolist(),
-                "rolloff": spectral_rolloff.tolist(),
-                "bandwidth": spectral_bandwidth.tolist(),
-                "zeroCrossingRate": zero_crossing_rate.tolist()
+                "centroid": _rounded(_downsample(spectral_centroids, feature_factor)),
+                "rolloff": _rounded(_downsample(spectral_rolloff, feature_factor)),
+                "bandwidth": _rounded(_downsample(spectral_bandwidth, feature_factor)),
+                "zeroCrossingRate": _rounded(_downsample(zcr, feature_factor))
             },
             "rhythm": {
                 "strength": float(rhythm_strength),
@@ -97,7 +453,8 @@ def analyze_audio(audio_path):
             "stats": {
                 "sampleRate": int(sr),
                 "beatCount": len(beats),
-                "avgEnergy": float(np.mean(rms_normalized))
+                "avgEnergy": float(np.mean(rms_normalized)),
+                "spectralFeatureRate": float(feature_rate)
             }
         }
         
@@ -110,6 +467,25 @@ def analyze_audio(audio_path):
         }
 
 
+@njit(cache=True)
+def _interval_stats(beat_times):
+    """Mean and standard deviation of beat intervals in a single pass"""
+    n = beat_times.size - 1
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n):
+        d = beat_times[i + 1] - beat_times[i]
+        total += d
+        total_sq += d * d
+    mean = total / n
+    var = total_sq / n - mean * mean
+    return mean, max(var, 0.0) ** 0.5
+
+
+# Compile once at import so the first analysis doesn't pay for it
+_interval_stats(np.arange(3, dtype=np.float64))
+
+
 def calculate_rhythm_regularity(beat_times):
     """
     Calculate how regular/consistent the beat timing is
@@ -123,15 +499,11 @@ def calculate_rhythm_regularity(beat_times):
     if len(beat_times) < 3:
         return 0.5
     
-    # Calculate intervals between beats
-    intervals = np.diff(beat_times)
-    
-    if len(intervals) == 0:
-        return 0.5
-    
-    # Calculate coefficient of variation (lower = more regular)
-    mean_interval = np.mean(intervals)
-    std_interval = np.std(intervals)
+    # Calculate coefficient of variation of the intervals between beats
+    # (lower = more regular)
+    mean_interval, std_interval = _interval_stats(
+        np.ascontiguousarray(beat_times, dtype=np.float64)
+    )
     
     if mean_interval == 0:
         return 0.5
@@ -145,22 +517,130 @@ def calculate_rhythm_regularity(beat_times):
     return regularity
 
 
+# BLAS/OpenMP thread limits held for the lifetime of a batch worker
+_worker_thread_limits = None
+
+
+def _init_batch_worker():
+    """Initialize a batch worker process"""
+    # Parallelism comes from the process pool; keep each worker's FFTs and
+    # BLAS/OpenMP pools single-threaded so workers don't compete for cores
+    global FFT_WORKERS, _worker_thread_limits, _read_buffer
+    FFT_WORKERS = 1
+    if threadpool_limits is not None:
+        _worker_thread_limits = threadpool_limits(limits=1)
+    
+    # Files are analyzed one at a time per worker, so decoding can reuse
+    # one buffer instead of allocating a waveform per file (up to
+    # READ_BUFFER_MAX_SAMPLES; longer files are allocated and freed as usual)
+    _read_buffer = np.empty(0, dtype=np.float32)
+
+
+def _analyze_batch_item(audio_path, bpm_hint=None, device='cpu'):
+    """Analyze one file in batch mode, tagging the result with its path"""
+    return {"path": audio_path, **analyze_audio(audio_path, bpm_hint, device)}
+
+
+def analyze_batch(audio_paths, max_workers=None, bpm_hint=None, device='cpu'):
+    """
+    Analyze many files in one invocation
+    
+    librosa/numba are imported once per worker process rather than once
+    per file, which dominates the cost for short clips.
+    
+    Args:
+        audio_paths: List of paths to audio files
+        max_workers: Number of worker processes (defaults to CPU count,
+            or GPU_BATCH_WORKERS for 'cuda')
+        bpm_hint: Known tempo in BPM applied to every file
+        device: Device for spectral features ('cpu' or 'cuda')
+        
+    Yields:
+        Result dictionaries, in the same order as audio_paths
+    """
+    if max_workers is None:
+        max_workers = GPU_BATCH_WORKERS if device == 'cuda' else os.cpu_count()
+    
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_batch_worker
+    ) as executor:
+        yield from executor.map(partial(_analyze_batch_item, bpm_hint=bpm_hint, device=device), audio_paths)
+
+
+def _positive_int(value):
+    """argparse type for options that must be a positive integer"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def _positive_float(value):
+    """argparse type for options that must be a positive number"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not (math.isfinite(number) and number > 0):
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0, got {value}")
+    return number
+
+
 def main():
     """Main entry point for command-line usage"""
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Analyze audio files with librosa")
+    parser.add_argument("audio_paths", nargs="*", help="Audio file path(s)")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Analyze many files (from arguments or one path per stdin line) "
+             "and emit one JSON result per line"
+    )
+    parser.add_argument(
+        "--workers", type=_positive_int, default=None,
+        help="Worker processes for --batch (defaults to CPU count, or "
+             f"{GPU_BATCH_WORKERS} with --device cuda)"
+    )
+    parser.add_argument(
+        "--bpm-hint", type=_positive_float, default=None,
+        help="Known tempo in BPM; beats are tracked at this tempo instead of estimating it"
+    )
+    parser.add_argument(
+        "--device", choices=["cpu", "cuda"], default="cpu",
+        help="Compute spectral features on the GPU (PyTorch) for tracks over "
+             f"{GPU_MIN_DURATION:.0f}s; falls back to CPU if CUDA is unavailable. "
+             "Each --batch worker opens its own CUDA context, so --batch "
+             f"defaults to {GPU_BATCH_WORKERS} worker"
+    )
+    parser.add_argument(
+        "--pretty", action="store_true",
+        help="Indent the JSON output for reading (single-file mode)"
+    )
+    args = parser.parse_args()
+    
+    if args.batch:
+        audio_paths = args.audio_paths or [line.strip() for line in sys.stdin if line.strip()]
+        for result in analyze_batch(audio_paths, args.workers, args.bpm_hint, args.device):
+            write_json(result)
+        return
+    
+    if len(args.audio_paths) != 1:
         print(json.dumps({
             "error": "missing_argument",
-            "message": "Usage: python audio_analysis.py <audio_file_path>"
+            "message": "Usage: python audio_analysis.py <audio_file_path> | --batch [audio_file_path ...]"
         }))
         sys.exit(1)
     
-    audio_path = sys.argv[1]
+    audio_path = args.audio_paths[0]
     
     # Perform analysis
-    result = analyze_audio(audio_path)
+    result = analyze_audio(audio_path, args.bpm_hint, args.device)
     
     # Output as JSON
-    print(json.dumps(result, indent=2))
+    write_json(result, indent=args.pretty)
 
 
 if __name__ == "__main__":
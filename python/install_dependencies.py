@@ -8,6 +8,22 @@ import sys
 import json
 import os
 
+# Same numba cache location as audio_analysis.py
+NUMBA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sora-director', 'numba')
+os.environ.setdefault('NUMBA_CACHE_DIR', NUMBA_CACHE_DIR)
+
+def warm_numba_cache():
+    """Compile librosa's numba kernels into the persistent cache"""
+    import numpy as np
+    import librosa
+    
+    sr = 22050
+    # Noise rather than silence: beat tracking skips its DP on a flat envelope
+    y = np.random.default_rng(0).standard_normal(sr * 2).astype(np.float32) * 0.1
+    librosa.beat.beat_track(y=y, sr=sr)
+    librosa.onset.onset_strength(y=y, sr=sr)
+    librosa.feature.rms(y=y)
+
 def install_dependencies():
     """Install required Python packages"""
     requirements = [
@@ -15,7 +31,9 @@ def install_dependencies():
         'numpy>=1.24.0',
         'scipy>=1.10.0',
         'soundfile>=0.12.0',
-        'numba>=0.57.0'
+        'numba>=0.57.0',
+        'orjson>=3.9.0',
+        'threadpoolctl>=3.1.0'
     ]
     
     try:
@@ -42,45 +60,51 @@ def install_dependencies():
         if pip_upgrade.returncode != 0:
             print(f"Warning: pip upgrade failed: {pip_upgrade.stderr}", file=sys.stderr)
         
-        # Install each requirement with better error handling
-        for requirement in requirements:
-            print(f"Installing {requirement}...", file=sys.stderr)
-            
-            # Try with --user flag first (safest)
+        # Install everything in one pip call so the resolver runs once.
+        # Prefer wheels, and never build the compiled numeric stack from source
+        pip_install = [
+            sys.executable, '-m', 'pip', 'install',
+            '--prefer-binary',
+            '--only-binary=numpy,scipy,numba,llvmlite',
+            *requirements
+        ]
+        
+        print(f"Installing {', '.join(requirements)}...", file=sys.stderr)
+        
+        # Try with --user first outside a virtualenv (safest; not allowed inside one)
+        result = None
+        if sys.prefix == sys.base_prefix:
+            result = subprocess.run(pip_install + ['--user'], capture_output=True, text=True)
+            if result.returncode != 0:
+                print("Retrying without --user flag...", file=sys.stderr)
+        
+        if result is None or result.returncode != 0:
+            result = subprocess.run(pip_install, capture_output=True, text=True)
+        
+        # If externally-managed-environment error, retry with --break-system-packages
+        if result.returncode != 0 and 'externally-managed-environment' in result.stderr:
+            print("Using --break-system-packages...", file=sys.stderr)
             result = subprocess.run(
-                [sys.executable, '-m', 'pip', 'install', requirement, '--user'],
+                pip_install + ['--break-system-packages'],
                 capture_output=True,
                 text=True
             )
-            
-            if result.returncode != 0:
-                # Try without --user flag
-                print(f"Retrying {requirement} without --user flag...", file=sys.stderr)
-                result = subprocess.run(
-                    [sys.executable, '-m', 'pip', 'install', requirement],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode != 0:
-                    # If externally-managed-environment error, try with --break-system-packages
-                    if 'externally-managed-environment' in result.stderr:
-                        print(f"Using --break-system-packages for {requirement}...", file=sys.stderr)
-                        result = subprocess.run(
-                            [sys.executable, '-m', 'pip', 'install', requirement, '--break-system-packages'],
-                            capture_output=True,
-                            text=True
-                        )
-                        
-                        if result.returncode != 0:
-                            raise Exception(f"Failed to install {requirement}: {result.stderr}")
-                    else:
-                        raise Exception(f"Failed to install {requirement}: {result.stderr}")
-            
-            print(f"✅ {requirement} installed", file=sys.stderr)
+        
+        if result.returncode != 0:
+            raise Exception(f"Failed to install dependencies: {result.stderr}")
+        
+        print("✅ Dependencies installed", file=sys.stderr)
         
         # Verify librosa installation
         import librosa
+        
+        # Pre-compile so the first analysis doesn't pay the JIT cost
+        print("Compiling audio analysis kernels...", file=sys.stderr)
+        try:
+            warm_numba_cache()
+        except Exception as e:
+            print(f"Warning: kernel pre-compilation failed: {e}", file=sys.stderr)
+        
         print(json.dumps({
             "success": True,
             "message": f"Successfully installed all dependencies. librosa version: {librosa.__version__}"
@@ -28,9 +28,20 @@ export interface NativeAudioFeatures {
         sampleRate: number;
         beatCount: number;
         avgEnergy: number;
+        spectralFeatureRate: number;  // Values per second in spectralFeatures arrays
     };
 }
 
+/**
+ * Energy timeline as emitted by the Python script: one level per analysis
+ * frame, with frame i at time i * hop / sr
+ */
+interface NativeEnergyTimeline {
+    hop: number;
+    sr: number;
+    levels: number[];
+}
+
 export interface NativeAudioError {
     error: string;
     message: string;
@@ -117,6 +128,9 @@ export class NativeAudioAnalysisService {
                 try {
                     // Parse JSON output
                     const result = JSON.parse(stdoutData);
+                    if (!('error' in result)) {
+                        result.energy = this.expandEnergyTimeline(result.energy);
+                    }
                     resolve(result);
                 } catch (error) {
                     logger.error('Failed to parse Python output:', stdoutData);
@@ -137,6 +151,14 @@ export class NativeAudioAnalysisService {
         });
     }
 
+    /**
+     * Expand the compact energy timeline into {time, level} points
+     */
+    private expandEnergyTimeline(timeline: NativeEnergyTimeline): EnergyLevel[] {
+        const secondsPerFrame = timeline.hop / timeline.sr;
+        return timeline.levels.map((level, i) => ({ time: i * secondsPerFrame, level }));
+    }
+
     /**
      * Extract tempo using librosa beat tracking
      */